@@ -11,7 +11,6 @@ from argparse import ArgumentParser, Namespace
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Sequence, Union, cast
 
-import httpx
 import yaml
 from yaml.parser import ParserError
 
@@ -20,6 +19,7 @@ from spectacles.client import (
     DEFAULT_API_VERSION,
     LOOKML_VALIDATION_TIMEOUT,
     LookerClient,
+    build_async_client,
 )
 from spectacles.exceptions import (
     GenericValidationError,
@@ -252,6 +252,14 @@ def process_pin_imports(input: List[str]) -> dict[str, str]:
     return dict(arg.split(":") for arg in input)
 
 
+def positive_float(value: str) -> float:
+    """Parse a number argument, rejecting zero and negative values."""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
 @handle_exceptions
 def main() -> None:
     """Runs main function. This is the entry point."""
@@ -318,6 +326,8 @@ def main() -> None:
                 target=args.target,
                 remote_reset=args.remote_reset,
                 concurrency=args.concurrency,
+                rate_limit=args.rate_limit,
+                poll_interval=args.poll_interval,
                 profile=args.profile,
                 runtime_threshold=args.runtime_threshold,
                 chunk_size=args.chunk_size,
@@ -663,6 +673,24 @@ def _build_sql_subparser(
         help="Specify how many concurrent queries you want to have running \
             against your data warehouse. The default is 10.",
     )
+    subparser.add_argument(
+        "--rate-limit",
+        type=positive_float,
+        help=(
+            "The maximum number of Looker API requests to make per second. "
+            "By default, requests are not rate limited."
+        ),
+    )
+    subparser.add_argument(
+        "--poll-interval",
+        type=positive_float,
+        default=0.5,
+        help=(
+            "How many seconds to wait between checks on running queries. "
+            "The interval backs off while no queries are finishing. "
+            "The default is 0.5 seconds."
+        ),
+    )
     subparser.add_argument(
         "-p",
         "--profile",
@@ -774,8 +802,7 @@ async def run_connect(
     base_url: str, client_id: str, client_secret: str, port: int, api_version: float
 ) -> None:
     """Tests the connection and credentials for the Looker API."""
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    async_client = build_async_client()
     try:
         LookerClient(
             async_client, base_url, client_id, client_secret, port, api_version
@@ -799,8 +826,7 @@ async def run_lookml(
     use_personal_branch: bool,
     timeout: int,
 ) -> None:
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    async_client = build_async_client()
     try:
         client = LookerClient(
             async_client, base_url, client_id, client_secret, port, api_version
@@ -858,8 +884,7 @@ async def run_content(
     pin_imports: Dict[str, str],
     use_personal_branch: bool,
 ) -> None:
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    async_client = build_async_client()
     try:
         client = LookerClient(
             async_client, base_url, client_id, client_secret, port, api_version
@@ -919,8 +944,7 @@ async def run_assert(
     use_personal_branch: bool,
     concurrency: int,
 ) -> None:
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    async_client = build_async_client()
     try:
         client = LookerClient(
             async_client, base_url, client_id, client_secret, port, api_version
@@ -980,13 +1004,21 @@ async def run_sql(
     pin_imports: Dict[str, str],
     use_personal_branch: bool,
     ignore_hidden: bool,
+    rate_limit: Optional[float] = None,
+    poll_interval: float = 0.5,
 ) -> None:
     """Runs and validates the SQL for each selected LookML dimension."""
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    async_client = build_async_client()
+    client: Optional[LookerClient] = None
     try:
         client = LookerClient(
-            async_client, base_url, client_id, client_secret, port, api_version
+            async_client,
+            base_url,
+            client_id,
+            client_secret,
+            port,
+            api_version,
+            rate_limit,
         )
         runner = Runner(client, project, remote_reset, pin_imports, use_personal_branch)
 
@@ -1001,8 +1033,11 @@ async def run_sql(
             runtime_threshold,
             chunk_size,
             ignore_hidden,
+            poll_interval,
         )
     finally:
+        if client is not None:
+            await client.close()
         await async_client.aclose()
 
     for test in sorted(results["tested"], key=lambda x: (x["model"], x["explore"])):
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import time
+from contextlib import suppress
 from dataclasses import dataclass
 from http import HTTPStatus
 from typing import Any, Callable, Dict, List, Optional, Tuple
@@ -66,6 +67,57 @@ class AccessToken:
         return False if time.time() < self.expires_at else True
 
 
+class TokenBucket:
+    """Paces requests to a steady rate, allowing short bursts of up to one second.
+
+    Args:
+        rate: Maximum number of requests per second.
+
+    """
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("Rate limit must be greater than zero")
+        self.rate = rate
+        self.tokens: asyncio.Queue[None] = asyncio.Queue(maxsize=max(int(rate), 1))
+        self._refill_task: Optional[asyncio.Task[None]] = None
+
+    async def _refill(self) -> None:
+        interval = 1 / self.rate
+        while True:
+            await self.tokens.put(None)  # Blocks while the bucket is full
+            await asyncio.sleep(interval)
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, starting the refill task on first use."""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(
+                self._refill(), name="refill_token_bucket"
+            )
+        await self.tokens.get()
+
+    async def close(self) -> None:
+        """Stop the refill task, if it's running."""
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._refill_task
+            self._refill_task = None
+
+
+def build_async_client() -> httpx.AsyncClient:
+    """Returns an HTTP/2 client that reuses pooled connections to the Looker API."""
+    # Don't trust env to ignore .netrc credentials
+    return httpx.AsyncClient(
+        trust_env=False,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=MAX_ASYNC_CONNECTIONS,
+            max_keepalive_connections=MAX_ASYNC_CONNECTIONS,
+        ),
+    )
+
+
 def backoff_with_exceptions(func: Callable[..., Any]) -> Callable[..., Any]:
     @backoff.on_exception(
         backoff.expo,
@@ -96,6 +148,7 @@ class LookerClient:
         client_secret: Looker API client secret.
         port: Desired API port to use for requests.
         api_version: Desired API version to use for requests.
+        rate_limit: Maximum number of API requests per second, unlimited if None.
 
     Attributes:
         api_url: Combined URL used as a base for request building.
@@ -111,8 +164,10 @@ class LookerClient:
         client_secret: str,
         port: Optional[int] = None,
         api_version: float = DEFAULT_API_VERSION,
+        rate_limit: Optional[float] = None,
     ):
         self.async_client = async_client
+        self._bucket = TokenBucket(rate_limit) if rate_limit is not None else None
         supported_api_versions = [4.0]
         if api_version not in supported_api_versions:
             raise SpectaclesException(
@@ -189,6 +244,11 @@ class LookerClient:
             f"using Looker API {self.api_version}"
         )
 
+    async def close(self) -> None:
+        """Stop any background work started by the client, like rate limiting."""
+        if self._bucket is not None:
+            await self._bucket.close()
+
     async def request(
         self, method: str, url: str, *args: Any, **kwargs: Any
     ) -> httpx.Response:
@@ -197,6 +257,8 @@ class LookerClient:
             self.authenticate()
             if self.workspace == "dev":
                 await self.update_workspace("dev")
+        if self._bucket is not None:
+            await self._bucket.acquire()
         return await self.async_client.request(method, url, *args, **kwargs)
 
     async def get(self, url: str, *args: Any, **kwargs: Any) -> httpx.Response:
@@ -168,25 +168,46 @@ def print_validation_result(
 def mark_line(lines: List[str], line_number: int, char: str = "*") -> List[str]:
     """For a list of strings, mark a specified line with a prepended character."""
     line_number -= 1  # Align with array indexing
-    marked = []
-    for i, line in enumerate(lines):
-        if i == line_number:
-            marked.append(char + " " + line)
-        else:
-            marked.append(dim("| " + line))
-    return marked
+    prefix = [dim("| " + line) for line in lines[: max(line_number, 0)]]
+    middle = [char + " " + lines[line_number]] if 0 <= line_number < len(lines) else []
+    suffix = [dim("| " + line) for line in lines[max(line_number + 1, 0) :]]
+    return prefix + middle + suffix
+
+
+def _slice_lines(text: str, start: int, stop: int) -> List[str]:
+    """Return lines [start, stop) of a string without splitting the whole thing."""
+    pos = 0
+    for _ in range(start):
+        pos = text.find("\n", pos) + 1
+        if not pos:  # The string has fewer lines than start
+            return []
+
+    lines = []
+    for _ in range(start, stop):
+        end = text.find("\n", pos)
+        if end == -1:
+            lines.append(text[pos:])
+            break
+        lines.append(text[pos:end])
+        pos = end + 1
+    return lines
 
 
 def extract_sql_context(sql: str, line_number: int, window_size: int = 2) -> str:
     """Extract a line of SQL with a specified amount of surrounding context."""
-    split = sql.split("\n")
+    not_found = f"(line {line_number} not in compiled SQL)"
+    if line_number < 1:
+        return not_found
+
     line_number -= 1  # Align with array indexing
     line_start = line_number - window_size
     line_end = line_number + (window_size + 1)
     line_start = line_start if line_start >= 0 else 0
-    line_end = line_end if line_end <= len(split) else len(split)
 
-    selected_lines = split[line_start:line_end]
-    marked = mark_line(selected_lines, line_number=line_number - line_start + 1)
-    context = "\n".join(marked)
+    selected_lines = _slice_lines(sql, line_start, line_end)
+    target = line_number - line_start
+    if target >= len(selected_lines):
+        return not_found
+
+    context = "\n".join(mark_line(selected_lines, target + 1))
     return context
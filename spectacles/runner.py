@@ -20,6 +20,7 @@ from spectacles.validators import (
 from spectacles.validators.data_test import DATA_TEST_CONCURRENCY
 from spectacles.validators.sql import (
     DEFAULT_CHUNK_SIZE,
+    DEFAULT_POLL_INTERVAL,
     DEFAULT_QUERY_CONCURRENCY,
     DEFAULT_RUNTIME_THRESHOLD,
 )
@@ -352,10 +353,13 @@ class Runner:
         runtime_threshold: int = DEFAULT_RUNTIME_THRESHOLD,
         chunk_size: int = DEFAULT_CHUNK_SIZE,
         ignore_hidden_fields: bool = False,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
     ) -> JsonDict:
         if filters is None:
             filters = ["*/*"]
-        validator = SqlValidator(self.client, concurrency, runtime_threshold)
+        validator = SqlValidator(
+            self.client, concurrency, runtime_threshold, poll_interval
+        )
         ephemeral = True if incremental else None
         # Create explore-level tests for the desired ref
         async with self.branch_manager(ref=ref, ephemeral=ephemeral):
@@ -372,7 +376,7 @@ class Runner:
             if incremental:
                 compiled_explores = await asyncio.gather(
                     *(
-                        validator.compile_explore(explore)
+                        validator.compile_explore(explore, ref=base_ref)
                         for explore in project.iter_explores()
                     )
                 )
@@ -405,7 +409,7 @@ class Runner:
 
                 compiled_explores = await asyncio.gather(
                     *(
-                        validator.compile_explore(explore)
+                        validator.compile_explore(explore, ref=target_ref)
                         for explore in target_project.iter_explores()
                     )
                 )
@@ -455,7 +459,7 @@ class Runner:
                 logger.debug("Compiling SQL for dimensions at the target ref")
                 compiled_dimensions = await asyncio.gather(
                     *(
-                        validator.compile_dimension(dimension)
+                        validator.compile_dimension(dimension, ref=target_ref)
                         for dimension in project.iter_dimensions(errored=True)
                     )
                 )
@@ -2,8 +2,20 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import re
 import time
-from typing import Any, Callable, Coroutine, Dict, Iterable, List, Optional, Tuple
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    overload,
+)
 from urllib import parse
 
 import httpx
@@ -11,12 +23,28 @@ import httpx
 from spectacles.logger import GLOBAL_LOGGER as logger
 from spectacles.models import T
 
+_LINE_NUM_PATTERNS: Tuple[re.Pattern[str], ...] = (
+    re.compile(r"at \[(\d+):\d+\]"),  # BigQuery
+    re.compile(r"line (\d+) at position \d+"),  # Snowflake
+    re.compile(r"LINE (\d+):"),  # Redshift and Postgres
+)
+
 
 def compose_url(base_url: str, path: List[str], params: Dict[str, Any] = {}) -> str:
     if not isinstance(path, list):
         raise TypeError("URL path must be a list")
-    path_parts = [base_url] + path
-    url_with_path = "/".join(str(part).strip("/") for part in path_parts)
+
+    # Most API calls have one or two path parts and no params, so skip the join
+    if not params and 0 < len(path) <= 2:
+        url = f"{base_url.strip('/')}/{str(path[0]).strip('/')}"
+        return url if len(path) == 1 else f"{url}/{str(path[1]).strip('/')}"
+
+    path_parts = [base_url.strip("/")]
+    path_parts.extend(
+        part.strip("/") if isinstance(part, str) else str(part).strip("/")
+        for part in path
+    )
+    url_with_path = "/".join(path_parts)
 
     # comma separate each param list
     for k in params.keys():
@@ -38,6 +66,15 @@ def details_from_http_error(response: httpx.Response) -> Optional[Dict[str, Any]
     return details  # type: ignore[no-any-return]
 
 
+def parse_error_line_number(error_message: str) -> Optional[int]:
+    """Extract the line number of a SQL error from a warehouse error message."""
+    for pattern in _LINE_NUM_PATTERNS:
+        match = pattern.search(error_message)
+        if match:
+            return int(match.group(1))
+    return None
+
+
 def human_readable(elapsed: float) -> str:
     minutes, seconds = divmod(elapsed, 60)
     num_mins = f"{minutes:.0f} minute{'s' if minutes > 1 else ''}"
@@ -105,3 +142,20 @@ def halt_queue(queue: asyncio.Queue[Any]) -> None:
             queue.task_done()
         except ValueError:  # ValueError raised when no unfinished tasks remain
             break
+
+
+@overload
+def iter_queue(queue: asyncio.Queue[Optional[T]]) -> AsyncIterator[T]: ...  # noqa: E704
+
+
+@overload
+def iter_queue(queue: asyncio.Queue[T]) -> AsyncIterator[T]: ...  # noqa: E704
+
+
+async def iter_queue(queue: asyncio.Queue[Any]) -> AsyncIterator[Any]:
+    """Yield items from an async queue as they arrive until a sentinel None is received.
+
+    Marking items as done is left to the consumer.
+    """
+    while (item := await queue.get()) is not None:
+        yield item
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Iterator, List, Optional, Tuple
+from typing import AsyncIterator, FrozenSet, Iterator, List, Optional, Tuple
 
 import pydantic
 from tabulate import tabulate
@@ -19,7 +21,12 @@ from spectacles.models import (
     QueryResult,
 )
 from spectacles.printer import print_header
-from spectacles.utils import consume_queue, halt_queue
+from spectacles.utils import (
+    consume_queue,
+    halt_queue,
+    iter_queue,
+    parse_error_line_number,
+)
 
 QUERY_TASK_LIMIT = 250
 DEFAULT_CHUNK_SIZE = 500
@@ -27,7 +34,12 @@ DEFAULT_QUERY_CONCURRENCY = 10
 DEFAULT_RUNTIME_THRESHOLD = 5
 EXPIRED_QUERY_WAIT_TIME = 300
 EXPIRED_RETRY_LIMIT = 1
+COMPILE_CACHE_SIZE = 1000
+DEFAULT_POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 5.0
+POLL_BACKOFF_FACTOR = 1.5
 ProfilerTableRow = Tuple[str, str, float, str, str]
+CompileCacheKey = Tuple[Optional[str], str, str, FrozenSet[str]]
 
 
 @dataclass
@@ -122,6 +134,8 @@ class SqlValidator:
         concurrency: The number of simultaneous queries to run.
         runtime_threshold: When profiling, only display queries lasting longer
             than this.
+        poll_interval: Seconds to wait between checks on running queries. Backs off
+            while no queries are finishing, resetting once one does.
 
     Attributes:
         project: LookML project object representation.
@@ -134,109 +148,106 @@ class SqlValidator:
         client: LookerClient,
         concurrency: int = DEFAULT_QUERY_CONCURRENCY,
         runtime_threshold: int = DEFAULT_RUNTIME_THRESHOLD,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
     ):
         self.client = client
         self.concurrency = concurrency
         self.runtime_threshold = runtime_threshold
+        self.poll_interval = poll_interval
         self._task_to_query: dict[str, Query] = {}
+        self._task_waiters: dict[str, asyncio.Future[None]] = {}
         self._long_running_queries: List[Query] = []
+        self._compile_cache: OrderedDict[CompileCacheKey, str] = OrderedDict()
+
+    async def _compile(
+        self,
+        model: str,
+        explore: str,
+        dimensions: List[str],
+        ref: Optional[str],
+        dimension: Optional[str] = None,
+    ) -> str:
+        """Compile the SQL for a set of dimensions, reusing SQL compiled before.
+
+        Compiled SQL is cached per Git ref, since the same dimensions can compile
+        to different SQL on different branches or commits.
+        """
+        key = (ref, model, explore, frozenset(dimensions))
+        if key in self._compile_cache:
+            self._compile_cache.move_to_end(key)
+            return self._compile_cache[key]
 
-    async def compile_explore(self, explore: Explore) -> CompiledSql:
+        query = await self.client.create_query(
+            model, explore, dimensions, fields=["id"]
+        )
+        sql: str = await self.client.run_query(
+            query["id"], explore=explore, model=model, dimension=dimension
+        )
+        self._compile_cache[key] = sql
+        if len(self._compile_cache) > COMPILE_CACHE_SIZE:
+            # Evict the least recently used SQL
+            self._compile_cache.popitem(last=False)
+        return sql
+
+    async def compile_explore(
+        self, explore: Explore, ref: Optional[str] = None
+    ) -> CompiledSql:
         if explore.skipped:
             sql = ""
         else:
-            dimensions = [dimension.name for dimension in explore.dimensions]
             # Create a query that includes all dimensions
-            query = await self.client.create_query(
-                explore.model_name, explore.name, dimensions, fields=["id"]
-            )
-            sql = await self.client.run_query(
-                query["id"], explore=explore.name, model=explore.model_name
+            sql = await self._compile(
+                explore.model_name,
+                explore.name,
+                [dimension.name for dimension in explore.dimensions],
+                ref,
             )
 
         return CompiledSql.from_explore(explore, sql)
 
-    async def compile_dimension(self, dimension: Dimension) -> CompiledSql:
+    async def compile_dimension(
+        self, dimension: Dimension, ref: Optional[str] = None
+    ) -> CompiledSql:
         # Create a query for the dimension
-        query = await self.client.create_query(
+        sql = await self._compile(
             dimension.model_name,
             dimension.explore_name,
             [dimension.name],
-            fields=["id"],
-        )
-        sql = await self.client.run_query(
-            query["id"],
-            explore=dimension.explore_name,
-            model=dimension.model_name,
+            ref,
             dimension=dimension.name,
         )
         return CompiledSql.from_dimension(dimension, sql)
 
-    async def search(
-        self,
-        explores: tuple[Explore, ...],
-        fail_fast: bool,
-        chunk_size: int = DEFAULT_CHUNK_SIZE,
-        profile: bool = False,
-    ) -> None:
+    @asynccontextmanager
+    async def run_scope(
+        self, fail_fast: bool
+    ) -> AsyncIterator[Tuple[asyncio.Queue[Optional[Query]], asyncio.Queue[str]]]:
+        """Start the query workers, yielding their queues and shutting them down on exit.
+
+        Yields:
+            The queue of queries to run and the queue of running query task IDs.
+
+        """
         queries_to_run: asyncio.Queue[Optional[Query]] = asyncio.Queue()
         running_queries: asyncio.Queue[str] = asyncio.Queue()
-        query_slot = asyncio.Semaphore(self.concurrency)
 
+        # Each run_query worker keeps at most one query running at a time
         workers = (
-            asyncio.create_task(
-                self._run_query(queries_to_run, running_queries, query_slot),
-                name="run_query",
+            *(
+                asyncio.create_task(
+                    self._run_query(queries_to_run, running_queries),
+                    name="run_query",
+                )
+                for _ in range(self.concurrency)
             ),
             asyncio.create_task(
-                self._get_query_results(
-                    queries_to_run, running_queries, fail_fast, query_slot
-                ),
+                self._get_query_results(queries_to_run, running_queries, fail_fast),
                 name="get_query_results",
             ),
         )
 
         try:
-            for explore in explores:
-                # Sorting makes it more likely to prune the tree faster in binsearch
-                dimensions = tuple(sorted(explore.dimensions))
-                if explore.skipped:
-                    continue
-                elif len(dimensions) <= chunk_size:
-                    queries_to_run.put_nowait(Query(explore, dimensions))
-                else:
-                    for i in range(0, len(dimensions), chunk_size):
-                        chunk = dimensions[i : i + chunk_size]
-                        query = Query(explore, chunk)
-                        queries_to_run.put_nowait(query)
-
-            # Wait for all work to complete
-            await queries_to_run.join()
-            await running_queries.join()
-            logger.debug("Successfully joined all queues")
-        except KeyboardInterrupt:
-            logger.info(
-                "\n\n" + "Please wait, asking Looker to cancel any running queries..."
-            )
-            task_ids = []
-            while not running_queries.empty():
-                task_id = running_queries.get_nowait()
-                task_ids.append(task_id)
-                await self.client.cancel_query_task(task_id)
-            if task_ids:
-                message = (
-                    f"Attempted to cancel {len(task_ids)} running "
-                    f"{'query' if len(task_ids) == 1 else 'queries'}."
-                )
-            else:
-                message = (
-                    "No queries were running at the time so nothing was cancelled."
-                )
-            raise SpectaclesException(
-                name="validation-keyboard-interrupt",
-                title="SQL validation was manually interrupted.",
-                detail=message,
-            )
+            yield queries_to_run, running_queries
         finally:
             # Shut down the workers gracefully
             for worker in workers:
@@ -248,20 +259,74 @@ class SqlValidator:
                 elif isinstance(result, Exception):
                     raise result
 
+    async def search(
+        self,
+        explores: tuple[Explore, ...],
+        fail_fast: bool,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        profile: bool = False,
+    ) -> None:
+        async with self.run_scope(fail_fast) as (queries_to_run, running_queries):
+            try:
+                for explore in explores:
+                    # Sorting makes it more likely to prune the tree faster in binsearch
+                    dimensions = tuple(sorted(explore.dimensions))
+                    if explore.skipped:
+                        continue
+                    elif len(dimensions) <= chunk_size:
+                        queries_to_run.put_nowait(Query(explore, dimensions))
+                    else:
+                        for i in range(0, len(dimensions), chunk_size):
+                            chunk = dimensions[i : i + chunk_size]
+                            query = Query(explore, chunk)
+                            queries_to_run.put_nowait(query)
+
+                # Wait for all work to complete
+                await queries_to_run.join()
+                await running_queries.join()
+                logger.debug("Successfully joined all queues")
+            except KeyboardInterrupt:
+                logger.info(
+                    "\n\n"
+                    + "Please wait, asking Looker to cancel any running queries..."
+                )
+                task_ids = []
+                while not running_queries.empty():
+                    task_id = running_queries.get_nowait()
+                    task_ids.append(task_id)
+                    await self.client.cancel_query_task(task_id)
+                if task_ids:
+                    message = (
+                        f"Attempted to cancel {len(task_ids)} running "
+                        f"{'query' if len(task_ids) == 1 else 'queries'}."
+                    )
+                else:
+                    message = (
+                        "No queries were running at the time so nothing was cancelled."
+                    )
+                raise SpectaclesException(
+                    name="validation-keyboard-interrupt",
+                    title="SQL validation was manually interrupted.",
+                    detail=message,
+                )
+
         if profile:
             print_profile_results(self._long_running_queries, self.runtime_threshold)
 
+    def _finish_query_task(self, task_id: str) -> None:
+        """Free up the run_query worker waiting on a finished query task."""
+        waiter = self._task_waiters.pop(task_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
     async def _run_query(
         self,
         queries_to_run: asyncio.Queue[Optional[Query]],
         running_queries: asyncio.Queue[str],
-        query_slot: asyncio.Semaphore,
     ) -> None:
         try:
             # End execution if a sentinel is received from the queue
-            while (query := await queries_to_run.get()) is not None:
-                logger.debug("Waiting to acquire a query slot")
-                await query_slot.acquire()
+            async for query in iter_queue(queries_to_run):
                 result = await self.client.create_query(
                     model=query.dimensions[0].model_name,
                     explore=query.dimensions[0].explore_name,
@@ -277,8 +342,12 @@ class SqlValidator:
                         "run Query.create to get a query ID"
                     )
                 task_id = await self.client.create_query_task(query.query_id)
+                waiter = asyncio.get_running_loop().create_future()
                 self._task_to_query[task_id] = query
+                self._task_waiters[task_id] = waiter
                 running_queries.put_nowait(task_id)
+                # Wait for _get_query_results to finish the query before taking more
+                await waiter
 
             logger.debug("Received sentinel, shutting down")
 
@@ -286,6 +355,8 @@ class SqlValidator:
             logger.error(
                 "Encountered an exception while running a query:", exc_info=True
             )
+            # Stop the other workers from starting any new queries
+            consume_queue(queries_to_run)
             logger.debug("Waiting for the running_queries queue to clear")
             await running_queries.join()
             raise
@@ -300,16 +371,15 @@ class SqlValidator:
         queries_to_run: asyncio.Queue[Optional[Query]],
         running_queries: asyncio.Queue[str],
         fail_fast: bool,
-        query_slot: asyncio.Semaphore,
     ) -> None:
+        poll_interval = self.poll_interval
         try:
-            while True:
-                task_ids = consume_queue(running_queries, limit=QUERY_TASK_LIMIT)
-                if not task_ids:
-                    logger.debug("No running queries, waiting for one to start...")
-                    await asyncio.sleep(0.5)
-                    continue
-
+            # Wait for a query to start, then check on it with any others running
+            async for first_task_id in iter_queue(running_queries):
+                task_ids = (first_task_id,) + consume_queue(
+                    running_queries, limit=QUERY_TASK_LIMIT - 1
+                )
+                still_running = 0
                 raw = await self.client.get_query_task_multi_results(task_ids)
                 for task_id, result in raw.items():
                     try:
@@ -339,12 +409,12 @@ class SqlValidator:
                         if query_result.runtime > self.runtime_threshold:
                             self._long_running_queries.append(query)
                         if query_result.status == "complete":
-                            query_slot.release()
+                            self._finish_query_task(task_id)
                             query.errored = False
                             query.explore.queried = True
                             queries_to_run.task_done()
                         else:
-                            query_slot.release()
+                            self._finish_query_task(task_id)
                             query.errored = True
 
                             # Fail fast, assign the error(s) to its explore
@@ -355,7 +425,7 @@ class SqlValidator:
                                     line_number = (
                                         error.sql_error_loc.line
                                         if error.sql_error_loc
-                                        else None
+                                        else parse_error_line_number(error.full_message)
                                     )
                                     explore.errors.append(
                                         SqlError(
@@ -382,7 +452,7 @@ class SqlValidator:
                                     line_number = (
                                         error.sql_error_loc.line
                                         if error.sql_error_loc
-                                        else None
+                                        else parse_error_line_number(error.full_message)
                                     )
                                     dimension.errors.append(
                                         SqlError(
@@ -430,7 +500,7 @@ class SqlValidator:
                                 explore_url=query.explore_url,
                             )
                         )
-                        query_slot.release()
+                        self._finish_query_task(task_id)
                         queries_to_run.task_done()
 
                     elif (
@@ -475,33 +545,44 @@ class SqlValidator:
                                         explore_url=query.explore_url,
                                     )
                                 )
-                            query_slot.release()
+                            self._finish_query_task(task_id)
                             queries_to_run.task_done()
                         else:
+                            still_running += 1
                             await running_queries.put(task_id)
 
                     else:
                         # Query still running, put the task back on the queue
+                        still_running += 1
                         await running_queries.put(task_id)
 
                 # Notify queue that all task IDs were processed
                 for _ in range(len(task_ids)):
                     running_queries.task_done()
 
-                await asyncio.sleep(0.5)
+                if still_running == len(task_ids):
+                    # Nothing finished, so wait a little longer before checking again
+                    poll_interval = min(
+                        poll_interval * POLL_BACKOFF_FACTOR,
+                        max(MAX_POLL_INTERVAL, self.poll_interval),
+                    )
+                else:
+                    poll_interval = self.poll_interval
+                await asyncio.sleep(poll_interval)
         except Exception:
             logger.error(
                 "Encountered an exception while retrieving results:", exc_info=True
             )
-            # Put a sentinel on the run query queue to shut it down
+            # Put a sentinel on the run query queue for each worker to shut it down
             consume_queue(queries_to_run)
-            queries_to_run.put_nowait(None)
-            # Wait until the sentinel has been consumed and handled
+            for _ in range(self.concurrency):
+                queries_to_run.put_nowait(None)
+            # Wait until the sentinels have been consumed and handled
             while not queries_to_run.empty():
                 logger.debug("Waiting for the queries_to_run queue to clear")
-                # _run_query can get bogged down waiting for query slots, so free them
-                if query_slot.locked():
-                    query_slot.release()
+                # Workers can get stuck waiting on running queries, so free them
+                for task_id in tuple(self._task_waiters):
+                    self._finish_query_task(task_id)
                 await asyncio.sleep(1)
             raise
         finally:
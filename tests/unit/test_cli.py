@@ -11,7 +11,9 @@ from spectacles.cli import (
     main,
     preprocess_dash,
     process_pin_imports,
+    run_sql,
 )
+from spectacles.client import LookerClient
 from spectacles.exceptions import (
     GenericValidationError,
     LookerApiError,
@@ -236,6 +238,114 @@ def test_cli_explores_folders_processed_correctly(
     ]
 
 
+@patch("spectacles.cli.run_sql")
+def test_cli_rate_limit_passed_to_run_sql(
+    mock_run_sql: AsyncMock, clean_env: None
+) -> None:
+    with patch(
+        "sys.argv",
+        [
+            "spectacles",
+            "sql",
+            "--base-url",
+            "BASE_URL",
+            "--client-id",
+            "CLIENT_ID",
+            "--client-secret",
+            "CLIENT_SECRET",
+            "--project",
+            "spectacles",
+            "--rate-limit",
+            "2.5",
+        ],
+    ):
+        main()
+    assert mock_run_sql.call_args[1]["rate_limit"] == 2.5
+
+
+@patch("spectacles.cli.run_sql")
+def test_cli_poll_interval_passed_to_run_sql(
+    mock_run_sql: AsyncMock, clean_env: None
+) -> None:
+    with patch(
+        "sys.argv",
+        [
+            "spectacles",
+            "sql",
+            "--base-url",
+            "BASE_URL",
+            "--client-id",
+            "CLIENT_ID",
+            "--client-secret",
+            "CLIENT_SECRET",
+            "--project",
+            "spectacles",
+            "--poll-interval",
+            "2",
+        ],
+    ):
+        main()
+    assert mock_run_sql.call_args[1]["poll_interval"] == 2.0
+
+
+@patch.object(LookerClient, "close")
+@patch.object(LookerClient, "authenticate")
+@patch("spectacles.cli.Runner")
+async def test_run_sql_closes_client_after_failure(
+    mock_runner: MagicMock, mock_authenticate: MagicMock, mock_close: AsyncMock
+) -> None:
+    mock_runner.return_value.validate_sql = AsyncMock(side_effect=RuntimeError)
+    with pytest.raises(RuntimeError):
+        await run_sql(
+            log_dir="logs",
+            project="spectacles",
+            ref="main",
+            filters=["*/*"],
+            base_url="https://spectacles.looker.com",
+            client_id="CLIENT_ID",
+            client_secret="CLIENT_SECRET",
+            port=19999,
+            api_version=4.0,
+            fail_fast=True,
+            incremental=False,
+            target="",
+            remote_reset=False,
+            concurrency=10,
+            profile=False,
+            runtime_threshold=5,
+            chunk_size=500,
+            pin_imports={},
+            use_personal_branch=False,
+            ignore_hidden=False,
+            rate_limit=2.0,
+        )
+    mock_close.assert_awaited_once()
+
+
+@pytest.mark.parametrize("option", ("--poll-interval", "--rate-limit"))
+@pytest.mark.parametrize("value", ("0", "-1"))
+def test_cli_rejects_non_positive_rates(
+    option: str, value: str, clean_env: None
+) -> None:
+    parser = create_parser()
+    with pytest.raises(SystemExit):
+        parser.parse_args(
+            [
+                "sql",
+                "--base-url",
+                "BASE_URL",
+                "--client-id",
+                "CLIENT_ID",
+                "--client-secret",
+                "CLIENT_SECRET",
+                "--project",
+                "spectacles",
+                option,
+                value,
+            ]
+        )
+
+
 def test_parse_args_with_only_env_vars(env: None) -> None:
     parser = create_parser()
     args = parser.parse_args(["connect"])
@@ -2,13 +2,19 @@ import asyncio
 import inspect
 import time
 from typing import Any, Callable, Dict, List, Tuple
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 import respx
 
-from spectacles.client import AccessToken, LookerClient
+from spectacles.client import (
+    MAX_ASYNC_CONNECTIONS,
+    AccessToken,
+    LookerClient,
+    TokenBucket,
+    build_async_client,
+)
 from spectacles.exceptions import LookerApiError
 
 
@@ -34,6 +40,7 @@ def get_client_method_names() -> List[str]:
     for skip_method in (
         "authenticate",
         "cancel_query_task",
+        "close",
         "request",
         "get",
         "post",
@@ -163,3 +170,61 @@ async def test_bad_http_status_should_cause_backoff_and_retry(
     )
     await looker_client.run_lookml_test(project=project)
     assert mocked_api["run_lookml_test"].call_count == 3
+
+
+async def test_token_bucket_paces_requests() -> None:
+    bucket = TokenBucket(rate=50)
+    start = time.time()
+    for _ in range(6):
+        await bucket.acquire()
+    elapsed = time.time() - start
+    await bucket.close()
+    # Tokens are added every 1 / 50 seconds, starting from an empty bucket
+    assert elapsed >= 0.09
+
+
+async def test_token_bucket_close_stops_refilling() -> None:
+    bucket = TokenBucket(rate=50)
+    await bucket.acquire()
+    refill_task = bucket._refill_task
+    await bucket.close()
+    assert refill_task is not None and refill_task.cancelled()
+    assert bucket._refill_task is None
+
+
+def test_token_bucket_requires_positive_rate() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+async def test_rate_limited_client_acquires_a_token_per_request(
+    mocked_api: respx.MockRouter,
+) -> None:
+    async with httpx.AsyncClient(trust_env=False) as async_client:
+        client = LookerClient(
+            async_client,
+            "https://spectacles.looker.com",
+            "client_id",
+            "client_secret",
+            rate_limit=100,
+        )
+        assert client._bucket is not None
+        with patch.object(client._bucket, "acquire", AsyncMock()) as mock_acquire:
+            await client.update_workspace("production")
+        mock_acquire.assert_awaited_once()
+
+
+@patch("spectacles.client.httpx.AsyncClient")
+def test_build_async_client_uses_pooled_http2_connections(
+    mock_async_client: MagicMock,
+) -> None:
+    async_client = build_async_client()
+    assert async_client is mock_async_client.return_value
+    mock_async_client.assert_called_once_with(
+        trust_env=False,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=MAX_ASYNC_CONNECTIONS,
+            max_keepalive_connections=MAX_ASYNC_CONNECTIONS,
+        ),
+    )
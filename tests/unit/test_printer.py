@@ -28,6 +28,39 @@ def test_extract_sql_context_line_number_close_to_beginning() -> None:
     assert delete_color_codes(result) == expected_result
 
 
+def test_extract_sql_context_line_number_on_first_line() -> None:
+    text = "\n".join([f"{n}" for n in range(1, 21)])
+    expected_result = "* 1\n| 2\n| 3"
+    result = printer.extract_sql_context(sql=text, line_number=1, window_size=2)
+    assert delete_color_codes(result) == expected_result
+
+
+def test_extract_sql_context_line_number_on_last_line() -> None:
+    text = "\n".join([f"{n}" for n in range(1, 21)])
+    expected_result = "| 18\n| 19\n* 20"
+    result = printer.extract_sql_context(sql=text, line_number=20, window_size=2)
+    assert delete_color_codes(result) == expected_result
+
+
+def test_extract_sql_context_line_number_past_end() -> None:
+    text = "\n".join([f"{n}" for n in range(1, 21)])
+    result = printer.extract_sql_context(sql=text, line_number=30, window_size=2)
+    assert result == "(line 30 not in compiled SQL)"
+
+
+def test_extract_sql_context_line_number_before_start() -> None:
+    text = "\n".join([f"{n}" for n in range(1, 21)])
+    result = printer.extract_sql_context(sql=text, line_number=0, window_size=2)
+    assert result == "(line 0 not in compiled SQL)"
+
+
+def test_extract_sql_context_with_trailing_newline() -> None:
+    text = "1\n2\n3\n"
+    expected_result = "| 1\n| 2\n* 3\n| "
+    result = printer.extract_sql_context(sql=text, line_number=3, window_size=2)
+    assert delete_color_codes(result) == expected_result
+
+
 def test_mark_line_odd_number_of_lines() -> None:
     text = [f"{n}" for n in range(1, 6)]
     expected_result = ["| 1", "| 2", "* 3", "| 4", "| 5"]
@@ -44,6 +77,15 @@ def test_mark_line_even_number_of_lines() -> None:
     assert result == expected_result
 
 
+def test_mark_line_out_of_range_marks_nothing() -> None:
+    text = [f"{n}" for n in range(1, 4)]
+    expected_result = ["| 1", "| 2", "| 3"]
+    for line_number in (0, 4):
+        result = printer.mark_line(lines=text, line_number=line_number)
+        result = [delete_color_codes(line) for line in result]
+        assert result == expected_result
+
+
 @patch("spectacles.printer.log_sql_error", return_value="path_to_sql_file")
 def test_sql_error_prints_with_relevant_info(
     mock_log: MagicMock, caplog: pytest.LogCaptureFixture
@@ -8,6 +8,7 @@ from spectacles.exceptions import ContentError
 from spectacles.lookml import Explore, Model, Project
 from spectacles.models import JsonDict
 from spectacles.runner import Runner
+from spectacles.validators.sql import SqlValidator
 from tests.utils import build_validation
 
 
@@ -42,6 +43,41 @@ async def test_validate_content_returns_valid_schema(
     jsonschema.validate(result, schema)
 
 
+@patch.object(SqlValidator, "search")
+@patch("spectacles.runner.build_project")
+@patch("spectacles.runner.LookerBranchManager")
+async def test_incremental_validate_sql_compiles_each_ref(
+    mock_branch_manager: MagicMock,
+    mock_build_project: AsyncMock,
+    mock_search: AsyncMock,
+    project: Project,
+    model: Model,
+    explore: Explore,
+) -> None:
+    branch_manager: MagicMock = mock_branch_manager.return_value
+
+    def checkout(ref: str, ephemeral: bool = False) -> MagicMock:
+        branch_manager.ref = ref
+        return branch_manager
+
+    branch_manager.side_effect = checkout
+    model.explores = [explore]
+    project.models = [model]
+    mock_build_project.return_value = project
+    client = Mock(spec=LookerClient)
+    client.create_query = AsyncMock(return_value={"id": 1})
+    client.run_query = AsyncMock(side_effect=["SELECT base", "SELECT target"])
+
+    runner = Runner(client=client, project="eye_exam")
+    await runner.validate_sql(
+        ref="base", target="target", incremental=True, fail_fast=True
+    )
+
+    assert client.run_query.await_count == 2
+    assert not explore.skipped
+    assert mock_search.await_args_list[0].args[0] == (explore,)
+
+
 def test_incremental_same_results_should_not_have_errors() -> None:
     base = build_validation("content")
     target = build_validation("content")
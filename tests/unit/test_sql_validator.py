@@ -1,8 +1,8 @@
 import asyncio
 import json
 from copy import deepcopy
-from typing import Optional
-from unittest.mock import Mock, patch
+from typing import Any, Optional
+from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 import pytest
@@ -18,6 +18,7 @@ from spectacles.models import (
     QueryError,
 )
 from spectacles.validators.sql import Query, SqlValidator
+from tests.utils import background_task
 
 
 @pytest.fixture
@@ -40,13 +41,6 @@ def running_queries() -> "asyncio.Queue[str]":
     return queue
 
 
-@pytest.fixture
-def query_slot() -> asyncio.Semaphore:
-    """Creates a semaphore to limit query concurrency."""
-    semaphore = asyncio.Semaphore(1)
-    return semaphore
-
-
 @pytest.fixture
 def query(explore: Explore, dimension: Dimension) -> Query:
     return Query(explore, (dimension,), query_id="12345")
@@ -98,13 +92,74 @@ async def test_compile_dimension_compiles_sql(
     mocked_api["run_query"].calls.assert_called_once()
 
 
+async def test_compile_dimension_reuses_cached_sql(
+    mocked_api: respx.MockRouter,
+    dimension: Dimension,
+    validator: SqlValidator,
+) -> None:
+    query_id = 12345
+    sql = "SELECT * FROM users"
+    mocked_api.post("queries", params={"fields": "id"}, name="create_query").respond(
+        200, json={"id": query_id}
+    )
+    mocked_api.get(f"queries/{query_id}/run/sql", name="run_query").respond(
+        200, text=sql
+    )
+    first = await validator.compile_dimension(dimension)
+    second = await validator.compile_dimension(dimension)
+    assert first == second
+    mocked_api["run_query"].calls.assert_called_once()
+
+
+async def test_compile_dimension_caches_sql_per_ref(
+    mocked_api: respx.MockRouter,
+    dimension: Dimension,
+    validator: SqlValidator,
+) -> None:
+    query_id = 12345
+    mocked_api.post("queries", params={"fields": "id"}, name="create_query").respond(
+        200, json={"id": query_id}
+    )
+    mocked_api.get(f"queries/{query_id}/run/sql", name="run_query").mock(
+        side_effect=(
+            httpx.Response(200, text="SELECT 1"),
+            httpx.Response(200, text="SELECT 2"),
+        )
+    )
+    base = await validator.compile_dimension(dimension, ref="base")
+    target = await validator.compile_dimension(dimension, ref="target")
+    assert base.sql == "SELECT 1"
+    assert target.sql == "SELECT 2"
+    assert mocked_api["run_query"].call_count == 2
+
+
+@patch("spectacles.validators.sql.COMPILE_CACHE_SIZE", 1)
+async def test_compile_cache_evicts_least_recently_used_sql(
+    mocked_api: respx.MockRouter,
+    dimension: Dimension,
+    validator: SqlValidator,
+) -> None:
+    other_dimension = deepcopy(dimension)
+    other_dimension.name = "other_dimension"
+    mocked_api.post("queries", params={"fields": "id"}, name="create_query").respond(
+        200, json={"id": 12345}
+    )
+    mocked_api.get("queries/12345/run/sql", name="run_query").respond(
+        200, text="SELECT * FROM users"
+    )
+    await validator.compile_dimension(dimension)
+    await validator.compile_dimension(other_dimension)
+    await validator.compile_dimension(dimension)
+    assert mocked_api["run_query"].call_count == 3
+    assert len(validator._compile_cache) == 1
+
+
 async def test_run_query_works(
     mocked_api: respx.MockRouter,
     query: Query,
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     query_task_id = "abcdef12345"
     explore_url = "https://spectacles.looker.com/x"
@@ -118,21 +173,14 @@ async def test_run_query_works(
         name="create_query_task",
     ).respond(200, json={"id": query_task_id})
 
-    task = asyncio.create_task(
-        validator._run_query(queries_to_run, running_queries, query_slot)
-    )
-
-    await queries_to_run.put(query)
-    await running_queries.get()
-    # Have to manually mark the queue task as done, since normally this is handled by
-    # `SqlValidator._get_query_results`
-    queries_to_run.task_done()
-    query_slot.release()
-    await queries_to_run.join()
-    task.cancel()
-
-    with pytest.raises(asyncio.CancelledError):
-        await asyncio.gather(task)
+    async with background_task(validator._run_query(queries_to_run, running_queries)):
+        await queries_to_run.put(query)
+        task_id = await running_queries.get()
+        # Have to manually mark the queue task as done, since normally this is handled by
+        # `SqlValidator._get_query_results`
+        queries_to_run.task_done()
+        validator._finish_query_task(task_id)
+        await queries_to_run.join()
 
     mocked_api["create_query"].calls.assert_called_once()
     mocked_api["create_query_task"].calls.assert_called_once()
@@ -142,11 +190,8 @@ async def test_run_query_shuts_down_on_sentinel(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
-    task = asyncio.create_task(
-        validator._run_query(queries_to_run, running_queries, query_slot)
-    )
+    task = asyncio.create_task(validator._run_query(queries_to_run, running_queries))
 
     await queries_to_run.put(None)
     await queries_to_run.join()
@@ -159,7 +204,6 @@ async def test_run_query_handles_exceptions_raised_within(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     query_task_id = "abcdef12345"
     explore_url = "https://spectacles.looker.com/x"
@@ -181,9 +225,7 @@ async def test_run_query_handles_exceptions_raised_within(
         name="create_query_task",
     ).respond(200, json={"id": query_task_id})
 
-    task = asyncio.create_task(
-        validator._run_query(queries_to_run, running_queries, query_slot)
-    )
+    task = asyncio.create_task(validator._run_query(queries_to_run, running_queries))
 
     second_query = deepcopy(query)
     second_dimension = deepcopy(query.dimensions[0])
@@ -192,12 +234,12 @@ async def test_run_query_handles_exceptions_raised_within(
 
     queries_to_run.put_nowait(query)  # This will succeed
     queries_to_run.put_nowait(second_query)  # This will fail with 404
-    await running_queries.get()  # Retrieve the successfully query
+    task_id = await running_queries.get()  # Retrieve the successfully query
     running_queries.task_done()
 
     # Normally these steps are handled by _get_query_results
     queries_to_run.task_done()
-    query_slot.release()
+    validator._finish_query_task(task_id)
     await queries_to_run.join()
 
     with pytest.raises(LookerApiError):
@@ -214,25 +256,17 @@ async def test_get_query_results_works(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     mocked_api.get("query_tasks/multi_results", name="get_query_results").respond(
         200, json={}
     )
 
     query_task_id = "abcdef12345"
-    task = asyncio.create_task(
-        validator._get_query_results(
-            queries_to_run, running_queries, fail_fast, query_slot
-        )
-    )
-
-    await running_queries.put(query_task_id)
-    await running_queries.join()
-    task.cancel()
-
-    with pytest.raises(asyncio.CancelledError):
-        await asyncio.gather(task)
+    async with background_task(
+        validator._get_query_results(queries_to_run, running_queries, fail_fast)
+    ):
+        await running_queries.put(query_task_id)
+        await running_queries.join()
 
     mocked_api["get_query_results"].calls.assert_called_once()
 
@@ -247,7 +281,6 @@ async def test_get_query_results_error_query_is_divided(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     query_task_id = "abcdef12345"
     message = "The users table does not exist"
@@ -271,19 +304,12 @@ async def test_get_query_results_error_query_is_divided(
     query.dimensions = (query.dimensions[0], query.dimensions[0])
     validator._task_to_query[query_task_id] = query
 
-    task = asyncio.create_task(
-        validator._get_query_results(
-            queries_to_run, running_queries, fail_fast, query_slot
-        )
-    )
-
-    await queries_to_run.put(query)
-    await running_queries.put(query_task_id)
-    await running_queries.join()
-    task.cancel()
-
-    with pytest.raises(asyncio.CancelledError):
-        await asyncio.gather(task)
+    async with background_task(
+        validator._get_query_results(queries_to_run, running_queries, fail_fast)
+    ):
+        await queries_to_run.put(query)
+        await running_queries.put(query_task_id)
+        await running_queries.join()
 
     mocked_api["get_query_results"].calls.assert_called_once()
     mock_divide.assert_not_called() if fail_fast else mock_divide.assert_called_once()
@@ -307,7 +333,6 @@ async def test_get_query_results_passing_query_is_not_divided(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     query_task_id = "abcdef12345"
     mocked_api.get("query_tasks/multi_results", name="get_query_results").respond(
@@ -325,19 +350,12 @@ async def test_get_query_results_passing_query_is_not_divided(
     )
     validator._task_to_query[query_task_id] = query
 
-    task = asyncio.create_task(
-        validator._get_query_results(
-            queries_to_run, running_queries, fail_fast, query_slot
-        )
-    )
-
-    await queries_to_run.put(query)
-    await running_queries.put(query_task_id)
-    await running_queries.join()
-    task.cancel()
-
-    with pytest.raises(asyncio.CancelledError):
-        await asyncio.gather(task)
+    async with background_task(
+        validator._get_query_results(queries_to_run, running_queries, fail_fast)
+    ):
+        await queries_to_run.put(query)
+        await running_queries.put(query_task_id)
+        await running_queries.join()
 
     mocked_api["get_query_results"].calls.assert_called_once()
     mock_divide.assert_not_called()
@@ -346,6 +364,47 @@ async def test_get_query_results_passing_query_is_not_divided(
     assert query in validator._long_running_queries
 
 
+@pytest.mark.parametrize("fail_fast", (True, False))
+async def test_get_query_results_parses_line_number_without_error_location(
+    fail_fast: bool,
+    mocked_api: respx.MockRouter,
+    query: Query,
+    validator: SqlValidator,
+    queries_to_run: asyncio.Queue[Optional[Query]],
+    running_queries: asyncio.Queue[str],
+) -> None:
+    query_task_id = "abcdef12345"
+    message = "Syntax error: Unexpected keyword FROM at [3:7]"
+    mocked_api.get("query_tasks/multi_results", name="get_query_results").respond(
+        200,
+        json={
+            query_task_id: {
+                "status": "error",
+                "data": {
+                    "id": query_task_id,
+                    "runtime": 1.0,
+                    "sql": "SELECT * FROM users",
+                    "errors": [{"message": message}],
+                },
+            }
+        },
+    )
+    validator._task_to_query[query_task_id] = query
+
+    async with background_task(
+        validator._get_query_results(queries_to_run, running_queries, fail_fast)
+    ):
+        await queries_to_run.put(query)
+        await running_queries.put(query_task_id)
+        await running_queries.join()
+
+    if fail_fast:
+        error = query.explore.errors[0]
+    else:
+        error = query.dimensions[0].errors[0]
+    assert error.metadata["line_number"] == 3
+
+
 @pytest.mark.parametrize("fail_fast", (True, False))
 async def test_get_query_results_handles_exceptions_raised_within(
     fail_fast: bool,
@@ -353,21 +412,19 @@ async def test_get_query_results_handles_exceptions_raised_within(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     query_task_id = "abcdef12345"
     mocked_api.get("query_tasks/multi_results", name="get_query_results").respond(404)
 
     task = asyncio.create_task(
-        validator._get_query_results(
-            queries_to_run, running_queries, fail_fast, query_slot
-        )
+        validator._get_query_results(queries_to_run, running_queries, fail_fast)
     )
 
     await running_queries.put(query_task_id)
-    # Normally we'd let the run_query task pick this up,
-    # but since it's not running we'll get it manually
-    await queries_to_run.get()
+    # Normally we'd let the run_query workers pick these up,
+    # but since they're not running we'll get the sentinels manually
+    for _ in range(validator.concurrency):
+        await queries_to_run.get()
     await running_queries.join()
 
     with pytest.raises(LookerApiError):
@@ -384,7 +441,6 @@ async def test_get_query_results_gives_up_after_killed_query(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     """Test the case where Looker returns a killed query status."""
 
@@ -395,21 +451,14 @@ async def test_get_query_results_gives_up_after_killed_query(
     )
     validator._task_to_query[query_task_id] = query
 
-    task = asyncio.create_task(
-        validator._get_query_results(
-            queries_to_run, running_queries, fail_fast, query_slot
-        )
-    )
-
-    await queries_to_run.put(query)
-    # A little silly, but we have to mimic what the create_query task would be doing
-    await queries_to_run.get()
-    await running_queries.put(query_task_id)
-    await running_queries.join()
-    task.cancel()
-
-    with pytest.raises(asyncio.CancelledError):
-        await asyncio.gather(task)
+    async with background_task(
+        validator._get_query_results(queries_to_run, running_queries, fail_fast)
+    ):
+        await queries_to_run.put(query)
+        # A little silly, but we have to mimic what the create_query task would be doing
+        await queries_to_run.get()
+        await running_queries.put(query_task_id)
+        await running_queries.join()
 
     assert queries_to_run.empty()  # Shouldn't retry anything
     assert query.errored
@@ -424,7 +473,6 @@ async def test_get_query_results_handles_bogus_expired_queries(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     """Test the case where Looker briefly returns an incorrectly expired status before
     finally returning an error status."""
@@ -464,19 +512,12 @@ async def test_get_query_results_handles_bogus_expired_queries(
 
     validator._task_to_query[query_task_id] = query
 
-    task = asyncio.create_task(
-        validator._get_query_results(
-            queries_to_run, running_queries, fail_fast, query_slot
-        )
-    )
-
-    await queries_to_run.put(query)
-    await running_queries.put(query_task_id)
-    await running_queries.join()
-    task.cancel()
-
-    with pytest.raises(asyncio.CancelledError):
-        await asyncio.gather(task)
+    async with background_task(
+        validator._get_query_results(queries_to_run, running_queries, fail_fast)
+    ):
+        await queries_to_run.put(query)
+        await running_queries.put(query_task_id)
+        await running_queries.join()
 
     assert query.errored
 
@@ -493,7 +534,6 @@ async def test_get_query_results_retries_actually_expired_queries(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     """Test the case where Looker returns a legitimate expired query status."""
     query_task_id = "abcdef12345"
@@ -504,19 +544,12 @@ async def test_get_query_results_retries_actually_expired_queries(
 
     validator._task_to_query[query_task_id] = query
 
-    task = asyncio.create_task(
-        validator._get_query_results(
-            queries_to_run, running_queries, fail_fast, query_slot
-        )
-    )
-
-    await queries_to_run.put(query)
-    await running_queries.put(query_task_id)
-    await running_queries.join()
-    task.cancel()
-
-    with pytest.raises(asyncio.CancelledError):
-        await asyncio.gather(task)
+    async with background_task(
+        validator._get_query_results(queries_to_run, running_queries, fail_fast)
+    ):
+        await queries_to_run.put(query)
+        await running_queries.put(query_task_id)
+        await running_queries.join()
 
     # The create query task isn't actually running, so pull the retry query
     # off the queue manually
@@ -534,7 +567,6 @@ async def test_get_query_results_gives_up_after_retrying_expired_queries(
     validator: SqlValidator,
     queries_to_run: asyncio.Queue[Optional[Query]],
     running_queries: asyncio.Queue[str],
-    query_slot: asyncio.Semaphore,
 ) -> None:
     """Test the case where Looker returns a legitimate expired query status
     but Spectacles has already exceeded the retry limit."""
@@ -547,25 +579,185 @@ async def test_get_query_results_gives_up_after_retrying_expired_queries(
     query.expired_retries = 2
     validator._task_to_query[query_task_id] = query
 
+    async with background_task(
+        validator._get_query_results(queries_to_run, running_queries, fail_fast)
+    ):
+        await queries_to_run.put(query)
+        # A little silly, but we have to mimic what the create_query task would be doing
+        await queries_to_run.get()
+        await running_queries.put(query_task_id)
+        await running_queries.join()
+
+    assert queries_to_run.empty()  # Shouldn't retry anything
+    assert query.errored
+    assert query.explore.errored
+
+
+@pytest.mark.parametrize(
+    "result",
+    (
+        {
+            "status": "complete",
+            "data": {"id": "abcdef12345", "runtime": 1.0, "sql": "SELECT 1"},
+        },
+        {
+            "status": "error",
+            "data": {
+                "id": "abcdef12345",
+                "runtime": 1.0,
+                "sql": "SELECT 1",
+                "errors": [{"message": "The users table does not exist"}],
+            },
+        },
+    ),
+)
+async def test_get_query_results_frees_waiting_worker(
+    result: dict[str, Any],
+    mocked_api: respx.MockRouter,
+    query: Query,
+    validator: SqlValidator,
+    queries_to_run: asyncio.Queue[Optional[Query]],
+    running_queries: asyncio.Queue[str],
+) -> None:
+    query_task_id = "abcdef12345"
+    mocked_api.get("query_tasks/multi_results", name="get_query_results").respond(
+        200, json={query_task_id: result}
+    )
+    waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    validator._task_to_query[query_task_id] = query
+    validator._task_waiters[query_task_id] = waiter
+
+    async with background_task(
+        validator._get_query_results(queries_to_run, running_queries, fail_fast=True)
+    ):
+        await queries_to_run.put(query)
+        await running_queries.put(query_task_id)
+        await running_queries.join()
+
+    assert waiter.done()
+    assert query_task_id not in validator._task_waiters
+
+
+async def test_get_query_results_shuts_down_every_worker_on_exception(
+    mocked_api: respx.MockRouter,
+    query: Query,
+    validator: SqlValidator,
+    queries_to_run: asyncio.Queue[Optional[Query]],
+    running_queries: asyncio.Queue[str],
+) -> None:
+    query_task_id = "abcdef12345"
+    mocked_api.get("query_tasks/multi_results", name="get_query_results").respond(404)
+    validator.concurrency = 3
+    waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    validator._task_to_query[query_task_id] = query
+    validator._task_waiters[query_task_id] = waiter
+
     task = asyncio.create_task(
-        validator._get_query_results(
-            queries_to_run, running_queries, fail_fast, query_slot
-        )
+        validator._get_query_results(queries_to_run, running_queries, fail_fast=False)
     )
 
-    await queries_to_run.put(query)
-    # A little silly, but we have to mimic what the create_query task would be doing
-    await queries_to_run.get()
     await running_queries.put(query_task_id)
-    await running_queries.join()
-    task.cancel()
+    sentinels = [await queries_to_run.get() for _ in range(validator.concurrency)]
 
-    with pytest.raises(asyncio.CancelledError):
+    with pytest.raises(LookerApiError):
         await asyncio.gather(task)
 
-    assert queries_to_run.empty()  # Shouldn't retry anything
-    assert query.errored
-    assert query.explore.errored
+    assert sentinels == [None, None, None]
+    assert queries_to_run.empty()
+    assert waiter.done()
+
+
+async def test_get_query_results_backs_off_while_queries_are_running(
+    mocked_api: respx.MockRouter,
+    query: Query,
+    validator: SqlValidator,
+    queries_to_run: asyncio.Queue[Optional[Query]],
+    running_queries: asyncio.Queue[str],
+) -> None:
+    query_task_id = "abcdef12345"
+    running = httpx.Response(
+        200, json={query_task_id: PendingQueryResult(status="running").model_dump()}
+    )
+    complete = httpx.Response(
+        200,
+        json={
+            query_task_id: {
+                "status": "complete",
+                "data": {"id": query_task_id, "runtime": 1.0, "sql": "SELECT 1"},
+            }
+        },
+    )
+    mocked_api.get("query_tasks/multi_results", name="get_query_results").mock(
+        side_effect=(running, running, running, complete)
+    )
+    validator._task_to_query[query_task_id] = query
+
+    with patch("spectacles.validators.sql.asyncio.sleep", AsyncMock()) as mock_sleep:
+        async with background_task(
+            validator._get_query_results(queries_to_run, running_queries, False)
+        ):
+            await queries_to_run.put(query)
+            await running_queries.put(query_task_id)
+            await running_queries.join()
+
+    intervals = [call.args[0] for call in mock_sleep.await_args_list]
+    assert intervals == [0.75, 1.125, 1.6875, validator.poll_interval]
+
+
+async def test_run_scope_runs_queries_and_shuts_down_workers(
+    mocked_api: respx.MockRouter,
+    explore: Explore,
+    dimension: Dimension,
+    validator: SqlValidator,
+) -> None:
+    query_task_id = "abcdef12345"
+    mocked_api.post(
+        "queries", params={"fields": "id,share_url"}, name="create_query"
+    ).respond(200, json={"id": 12345, "share_url": "https://spectacles.looker.com/x"})
+    mocked_api.post(
+        "query_tasks",
+        params={"fields": "id", "cache": "false"},
+        name="create_query_task",
+    ).respond(200, json={"id": query_task_id})
+    mocked_api.get("query_tasks/multi_results", name="get_query_results").respond(
+        200,
+        json={
+            query_task_id: {
+                "status": "complete",
+                "data": {"id": query_task_id, "runtime": 1.0, "sql": "SELECT 1"},
+            }
+        },
+    )
+    query = Query(explore, (dimension,))
+
+    async with validator.run_scope(fail_fast=False) as (
+        queries_to_run,
+        running_queries,
+    ):
+        await queries_to_run.put(query)
+        await queries_to_run.join()
+        await running_queries.join()
+
+    assert query.errored is False
+    task_names = [task.get_name() for task in asyncio.all_tasks()]
+    assert "run_query" not in task_names
+    assert "get_query_results" not in task_names
+
+
+async def test_run_scope_raises_exceptions_from_workers(
+    mocked_api: respx.MockRouter,
+    explore: Explore,
+    dimension: Dimension,
+    validator: SqlValidator,
+) -> None:
+    mocked_api.post(
+        "queries", params={"fields": "id,share_url"}, name="create_query"
+    ).respond(404)
+
+    with pytest.raises(LookerApiError):
+        async with validator.run_scope(fail_fast=False) as (queries_to_run, _):
+            await queries_to_run.put(Query(explore, (dimension,)))
+            await queries_to_run.join()
 
 
 @pytest.mark.parametrize("fail_fast", (True, False))
@@ -796,23 +988,18 @@ async def test_search_with_chunk_size_should_limit_queries(
     explore_url = "https://spectacles.looker.com/x"
 
     # Define some factories to make IDs sensible across requests
-    query_ids = []
-    query_task_ids = []
-
     def create_query_factory(
         request: httpx.Request, route: respx.Route
     ) -> httpx.Response:
         query_id = route.call_count + 1  # Use the call count for incrementing IDs
-        query_ids.append(query_id)
         return httpx.Response(200, json={"id": query_id, "share_url": explore_url})
 
     def create_query_task_factory(request: httpx.Request) -> httpx.Response:
-        query_id = query_ids.pop()
-        query_task_id = f"abcdef{query_id}"
-        query_task_ids.append(query_task_id)
-        return httpx.Response(200, json={"id": query_task_id})
+        query_id = json.loads(request.content)["query_id"]
+        return httpx.Response(200, json={"id": f"abcdef{query_id}"})
 
     def get_query_results_factory(request: httpx.Request) -> httpx.Response:
+        query_task_ids = request.url.params["query_task_ids"].split(",")
         response = httpx.Response(
             200,
             json={
@@ -867,27 +1054,21 @@ async def test_looker_api_error_with_queries_in_flight_shuts_down_gracefully(
     explore_url = "https://spectacles.looker.com/x"
 
     # Define some factories to make IDs sensible across requests
-    query_ids = []
-    query_task_ids = []
-
     def create_query_factory(
         request: httpx.Request, route: respx.Route
     ) -> httpx.Response:
         query_id = route.call_count + 1  # Use the call count for incrementing IDs
-        query_ids.append(query_id)
         return httpx.Response(200, json={"id": query_id, "share_url": explore_url})
 
     def create_query_task_factory(request: httpx.Request) -> httpx.Response:
-        query_id = query_ids[0]
+        query_id = json.loads(request.content)["query_id"]
         if query_id == 26:
             return httpx.Response(502, text="502: Bad Gateway")
         else:
-            query_ids.pop()
-            query_task_id = f"abcdef{query_id}"
-            query_task_ids.append(query_task_id)
-            return httpx.Response(200, json={"id": query_task_id})
+            return httpx.Response(200, json={"id": f"abcdef{query_id}"})
 
     def get_query_results_factory(request: httpx.Request) -> httpx.Response:
+        query_task_ids = request.url.params["query_task_ids"].split(",")
         response = httpx.Response(
             200,
             json={
@@ -1,3 +1,5 @@
+import asyncio
+from typing import Optional
 from unittest import IsolatedAsyncioTestCase
 from unittest.mock import AsyncMock
 
@@ -42,6 +44,42 @@ def test_compose_url_with_extra_slashes() -> None:
     assert url == "https://test.looker.com/api/3.0/login"
 
 
+def test_compose_url_with_non_string_path_components() -> None:
+    url = utils.compose_url(TEST_BASE_URL, ["queries", 42])  # type: ignore[list-item]
+    assert url == "https://test.looker.com/queries/42"
+
+
+def test_compose_url_two_path_components_and_params() -> None:
+    url = utils.compose_url(
+        TEST_BASE_URL, ["query_tasks", "multi_results"], {"query_task_ids": ["a", "b"]}
+    )
+    assert (
+        url == "https://test.looker.com/query_tasks/multi_results?query_task_ids=a%2Cb"
+    )
+
+
+def test_compose_url_no_path_components() -> None:
+    url = utils.compose_url(TEST_BASE_URL + "/", [])
+    assert url == "https://test.looker.com"
+
+
+parse_error_line_number_testcases = [
+    ("Syntax error: Unexpected keyword FROM at [12:5]", 12),
+    ("SQL compilation error: syntax error line 7 at position 4 unexpected 'FROM'.", 7),
+    ('ERROR: syntax error at or near "FROM"\nLINE 3: SELECT FROM users', 3),
+]
+
+
+@pytest.mark.parametrize("message,expected", parse_error_line_number_testcases)
+def test_parse_error_line_number(message: str, expected: int) -> None:
+    assert utils.parse_error_line_number(message) == expected
+
+
+def test_parse_error_line_number_returns_none_without_location() -> None:
+    message = "Column 'foo' not found"
+    assert utils.parse_error_line_number(message) is None
+
+
 human_readable_testcases = [
     (0.000002345, "0 seconds"),
     (0.02, "0 seconds"),
@@ -112,3 +150,11 @@ def test_chunks_returns_expected_results() -> None:
     assert len(list(utils.chunks(to_chunk, 9))) == 2
     assert len(list(utils.chunks(to_chunk, 10))) == 1
     assert len(list(utils.chunks(to_chunk, 11))) == 1
+
+
+async def test_iter_queue_stops_at_sentinel() -> None:
+    queue: asyncio.Queue[Optional[int]] = asyncio.Queue()
+    for item in (1, 2, None, 3):
+        queue.put_nowait(item)
+    assert [item async for item in utils.iter_queue(queue)] == [1, 2]
+    assert queue.get_nowait() == 3
@@ -1,9 +1,13 @@
+import asyncio
 import json
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Any, AsyncIterator, Coroutine, Dict, List, TypeVar, Union
 
 from spectacles.models import JsonDict
 
+T = TypeVar("T")
+
 
 def load_resource(filename: str) -> Union[List[JsonDict], JsonDict]:
     """Helper method to load a JSON file from tests/resources and parse it."""
@@ -63,3 +67,20 @@ def build_validation(validator: str) -> Dict[str, Any]:
                 )
             ],
         }
+
+
+@asynccontextmanager
+async def background_task(
+    coro: Coroutine[Any, Any, T]
+) -> AsyncIterator["asyncio.Task[T]"]:
+    """Runs a coroutine as a task for the duration of the block, then cancels it.
+
+    Stands in for asyncio.TaskGroup, which isn't available on Python 3.9.
+    """
+    task = asyncio.create_task(coro)
+    try:
+        yield task
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task